@@ -0,0 +1,361 @@
+from PyPDF2 import PdfReader
+import spacy
+import os
+import re
+from typing import Optional, List, Dict, Tuple
+from docx import Document
+from datetime import datetime
+
+nlp = spacy.load('en_core_web_sm')
+
+# Analysis profiles:
+#   fast     - tokenizer and stop list only, regex keywords for job descriptions
+#   standard - tokenizer for the resume, tagger and NER for job descriptions
+#   full     - complete en_core_web_sm pipeline for both
+ANALYSIS_PROFILES = ('fast', 'standard', 'full')
+DEFAULT_ANALYSIS_PROFILE = os.getenv("ANALYSIS_PROFILE", "full")
+STANDARD_PROFILE_DISABLED_PIPES = [
+    pipe for pipe in ('parser', 'lemmatizer') if pipe in nlp.pipe_names
+]
+
+if DEFAULT_ANALYSIS_PROFILE not in ANALYSIS_PROFILES:
+    raise ValueError(f"Invalid ANALYSIS_PROFILE: {DEFAULT_ANALYSIS_PROFILE}")
+
+# Bump when calculate_ats_score or generate_correction_suggestions change
+SCORING_VERSION = 1
+
+def parse_pdf_with_page_count(file_path: str) -> Tuple[str, int]:
+    with open(file_path, 'rb') as file:
+        reader = PdfReader(file)
+        text = ''
+        for page in reader.pages:
+            text += page.extract_text() or ''
+        page_count = len(reader.pages)
+    return text, page_count
+
+def parse_pdf(file_path: str) -> str:
+    return parse_pdf_with_page_count(file_path)[0]
+
+def parse_docx(file_path: str) -> str:
+    doc = Document(file_path)
+    text = ''
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + '\n'
+    return text
+
+def extract_email(text: str) -> Optional[str]:
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    emails = re.findall(email_pattern, text)
+    return emails[0] if emails else None
+
+def extract_phone(text: str) -> Optional[str]:
+    phone_patterns = [
+        r'\(\d{3}\)\s*\d{3}[-.]?\d{4}',
+        r'\d{3}[-.]?\d{3}[-.]?\d{4}',
+        r'\+\d{1,3}\s*\d{3}\s*\d{3}\s*\d{4}'
+    ]
+    for pattern in phone_patterns:
+        phones = re.findall(pattern, text)
+        if phones:
+            return phones[0]
+    return None
+
+def extract_linkedin(text: str) -> Optional[str]:
+    linkedin_pattern = r'(?:https?://)?(?:www\.)?linkedin\.com/in/[A-Za-z0-9-]+'
+    matches = re.findall(linkedin_pattern, text, re.IGNORECASE)
+    return matches[0] if matches else None
+
+def resolve_profile(profile: Optional[str]) -> str:
+    if not profile:
+        return DEFAULT_ANALYSIS_PROFILE
+    profile = profile.lower()
+    if profile not in ANALYSIS_PROFILES:
+        raise ValueError(
+            f"Invalid profile '{profile}'. Choose one of: {', '.join(ANALYSIS_PROFILES)}"
+        )
+    return profile
+
+def run_nlp(text: str, profile: str, for_job_description: bool = False):
+    if profile == 'fast' or (profile == 'standard' and not for_job_description):
+        # Tokenizer only; is_alpha/is_stop come from the vocab
+        return nlp.make_doc(text)
+    if profile == 'standard':
+        return nlp(text, disable=STANDARD_PROFILE_DISABLED_PIPES)
+    return nlp(text)
+
+def detect_sections(text: str) -> Dict[str, bool]:
+    sections = {
+        'contact_info': bool(extract_email(text) or extract_phone(text)),
+        'summary': bool(re.search(r'\b(summary|objective|profile)\b', text, re.IGNORECASE)),
+        'experience': bool(re.search(r'\b(experience|employment|work history)\b', text, re.IGNORECASE)),
+        'education': bool(re.search(r'\b(education|degree|university|college)\b', text, re.IGNORECASE)),
+        'skills': bool(re.search(r'\b(skills|competencies|technologies)\b', text, re.IGNORECASE)),
+        'projects': bool(re.search(r'\b(projects|portfolio)\b', text, re.IGNORECASE)),
+        'certifications': bool(re.search(r'\b(certifications?|licenses?)\b', text, re.IGNORECASE))
+    }
+    return sections
+
+def extract_keywords_from_job_description(job_desc: str, profile: str = 'full') -> List[str]:
+    if not job_desc:
+        return []
+    
+    # Extract technical skills, tools, and important terms
+    keywords = []
+    
+    # Common technical terms and skills
+    tech_patterns = [
+        r'\b(python|java|javascript|react|node\.?js|sql|aws|docker|kubernetes)\b',
+        r'\b(machine learning|ai|data science|analytics|agile|scrum)\b',
+        r'\b(git|github|ci/cd|devops|api|rest|microservices)\b'
+    ]
+    
+    for pattern in tech_patterns:
+        matches = re.findall(pattern, job_desc.lower())
+        keywords.extend(matches)
+    
+    # The fast profile has no tagger or NER, so stop at the regex matches
+    if profile == 'fast':
+        return list(set(keywords))
+    
+    doc = run_nlp(job_desc.lower(), profile, for_job_description=True)
+    
+    # Extract entities and noun phrases
+    for ent in doc.ents:
+        if ent.label_ in ['ORG', 'PRODUCT', 'SKILL']:
+            keywords.append(ent.text)
+    
+    # Extract important nouns
+    for token in doc:
+        if (token.pos_ == 'NOUN' and 
+            len(token.text) > 2 and 
+            not token.is_stop and 
+            token.is_alpha):
+            keywords.append(token.text)
+    
+    return list(set(keywords))
+
+def calculate_ats_score(resume_text: str, sections: Dict[str, bool], 
+                       job_keywords: List[str] = None) -> Dict:
+    score = 0
+    max_score = 100
+    feedback = []
+    
+    # Section completeness (40 points)
+    required_sections = ['contact_info', 'experience', 'education', 'skills']
+    section_score = sum(20 if sections.get(section, False) else 0 for section in required_sections[:2])
+    section_score += sum(10 if sections.get(section, False) else 0 for section in required_sections[2:])
+    
+    if not sections.get('contact_info'):
+        feedback.append("Add contact information (email, phone number)")
+    if not sections.get('experience'):
+        feedback.append("Include work experience section")
+    if not sections.get('education'):
+        feedback.append("Add education section")
+    if not sections.get('skills'):
+        feedback.append("Include a skills section")
+    
+    score += section_score
+    
+    # Content quality (30 points)
+    word_count = len(resume_text.split())
+    if word_count < 200:
+        feedback.append("Resume is too brief. Add more details about your experience")
+        score += 5
+    elif word_count > 800:
+        feedback.append("Resume is too lengthy. Consider condensing to 1-2 pages")
+        score += 20
+    else:
+        score += 30
+    
+    # Keyword matching (30 points) - only if job description provided
+    if job_keywords:
+        resume_lower = resume_text.lower()
+        matched_keywords = [kw for kw in job_keywords if kw in resume_lower]
+        keyword_score = min(30, len(matched_keywords) * 3)
+        score += keyword_score
+        
+        if len(matched_keywords) < len(job_keywords) * 0.3:
+            feedback.append(f"Include more relevant keywords from the job description")
+    else:
+        score += 15  # Partial score when no job description provided
+    
+    return {
+        'score': min(score, max_score),
+        'max_score': max_score,
+        'feedback': feedback
+    }
+
+def generate_correction_suggestions(resume_text: str, sections: Dict[str, bool], 
+                                  job_keywords: List[str] = None) -> List[Dict]:
+    suggestions = []
+    
+    # Format suggestions
+    if len(resume_text.split()) > 800:
+        suggestions.append({
+            'type': 'format',
+            'priority': 'high',
+            'title': 'Resume Length',
+            'description': 'Your resume is too long. Aim for 1-2 pages maximum.',
+            'suggestion': 'Remove outdated experiences and focus on recent, relevant accomplishments.'
+        })
+    
+    # Section suggestions
+    if not sections.get('summary'):
+        suggestions.append({
+            'type': 'content',
+            'priority': 'medium',
+            'title': 'Professional Summary',
+            'description': 'Add a professional summary at the top of your resume.',
+            'suggestion': 'Include 2-3 sentences highlighting your key qualifications and career goals.'
+        })
+    
+    if not sections.get('projects') and 'developer' in resume_text.lower():
+        suggestions.append({
+            'type': 'content',
+            'priority': 'medium',
+            'title': 'Projects Section',
+            'description': 'Consider adding a projects section to showcase your work.',
+            'suggestion': 'Include 2-3 relevant projects with brief descriptions and technologies used.'
+        })
+    
+    # Keyword suggestions
+    if job_keywords:
+        resume_lower = resume_text.lower()
+        missing_keywords = [kw for kw in job_keywords[:10] if kw not in resume_lower]
+        
+        if missing_keywords:
+            suggestions.append({
+                'type': 'keywords',
+                'priority': 'high',
+                'title': 'Missing Keywords',
+                'description': f'Your resume is missing key terms from the job description.',
+                'suggestion': f'Consider incorporating: {", ".join(missing_keywords[:5])}'
+            })
+    
+    # Contact info suggestions
+    if not extract_email(resume_text):
+        suggestions.append({
+            'type': 'contact',
+            'priority': 'high',
+            'title': 'Email Address',
+            'description': 'No email address found.',
+            'suggestion': 'Add a professional email address to your contact information.'
+        })
+    
+    if not extract_phone(resume_text):
+        suggestions.append({
+            'type': 'contact',
+            'priority': 'medium',
+            'title': 'Phone Number',
+            'description': 'No phone number found.',
+            'suggestion': 'Include a phone number in your contact information.'
+        })
+    
+    return suggestions
+
+def extract_text_and_page_count(file_path: str, filename: str) -> Tuple[str, int]:
+    # Read and parse the file based on its type; non-PDFs count as one page
+    if filename.lower().endswith('.pdf'):
+        return parse_pdf_with_page_count(file_path)
+    if filename.lower().endswith(('.docx', '.doc')):
+        return parse_docx(file_path), 1
+    # For other file types, try to read as text
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read(), 1
+    except:
+        return '', 1
+
+def extract_text_from_file(file_path: str, filename: str) -> str:
+    return extract_text_and_page_count(file_path, filename)[0]
+
+def extract_resume_features(content: str, profile: str) -> Dict:
+    """Run the expensive stages: NLP, contact and section detection."""
+    doc = run_nlp(content, profile)
+
+    # Extract keywords from resume
+    resume_keywords = [token.text.lower() for token in doc 
+                      if token.is_alpha and not token.is_stop and len(token.text) > 2]
+
+    return {
+        "contact_info": {
+            "email": extract_email(content),
+            "phone": extract_phone(content),
+            "linkedin": extract_linkedin(content)
+        },
+        "sections_detected": detect_sections(content),
+        "resume_keywords": list(set(resume_keywords))[:20],
+        "word_count": len(content.split())
+    }
+
+def score_resume(content: str, sections: Dict[str, bool],
+                 job_keywords: List[str] = None) -> Dict:
+    """Run the cheap stages: ATS score, suggestions and keyword matching."""
+    ats_analysis = calculate_ats_score(content, sections, job_keywords)
+    suggestions = generate_correction_suggestions(content, sections, job_keywords)
+
+    # Find matching and missing keywords
+    content_lower = content.lower()
+    matched_keywords = [kw for kw in job_keywords if kw in content_lower] if job_keywords else []
+    missing_keywords = [kw for kw in job_keywords if kw not in content_lower] if job_keywords else []
+
+    return {
+        "ats_score": {
+            "score": ats_analysis['score'],
+            "max_score": ats_analysis['max_score'],
+            "percentage": round((ats_analysis['score'] / ats_analysis['max_score']) * 100, 1),
+            "feedback": ats_analysis['feedback']
+        },
+        "keywords": {
+            "job_keywords": job_keywords or [],
+            "matched_keywords": matched_keywords,
+            "missing_keywords": missing_keywords[:10],  # Limit to top 10
+            "match_percentage": round((len(matched_keywords) / len(job_keywords)) * 100, 1) if job_keywords else 0
+        },
+        "suggestions": suggestions,
+        "scoring_version": SCORING_VERSION
+    }
+
+def analyze_text(content: str, filename: str, job_description: Optional[str] = None,
+                 profile: Optional[str] = None,
+                 job_keywords: Optional[List[str]] = None) -> Dict:
+    profile = resolve_profile(profile)
+    features = extract_resume_features(content, profile)
+
+    # Extract job description keywords if provided and not precomputed
+    if job_keywords is None:
+        job_keywords = extract_keywords_from_job_description(job_description, profile) if job_description else []
+    scores = score_resume(content, features['sections_detected'], job_keywords)
+
+    # Build comprehensive response
+    return {
+        "analysis_date": datetime.now().isoformat(),
+        "analysis_profile": profile,
+        "file_info": {
+            "filename": filename,
+            "file_type": filename.split('.')[-1].lower()
+        },
+        "contact_info": features['contact_info'],
+        "sections_detected": features['sections_detected'],
+        "ats_score": scores['ats_score'],
+        "keywords": {
+            "resume_keywords": features['resume_keywords'],
+            **scores['keywords']
+        },
+        "suggestions": scores['suggestions'],
+        "word_count": features['word_count'],
+        "has_job_description": bool(job_description),
+        "scoring_version": scores['scoring_version']
+    }
+
+def rescore_analysis(content: str, sections: Dict[str, bool], profile: str,
+                     job_description: Optional[str] = None,
+                     job_keywords: Optional[List[str]] = None) -> Dict:
+    """Re-run only the cheap stages against a stored analysis.
+
+    Pass job_keywords to reuse keywords already extracted for an unchanged
+    job description; otherwise they are extracted from job_description.
+    """
+    if job_keywords is None:
+        job_keywords = extract_keywords_from_job_description(job_description, profile) if job_description else []
+    return score_resume(content, sections, job_keywords)
@@ -25,9 +25,13 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 # Security
 security = HTTPBearer()
 
+# Fields of the user document that are never needed for authentication
+USER_PROJECTION = {"resumes": 0}
+optional_security = HTTPBearer(auto_error=False)
+
 async def get_user_by_email(db: AsyncIOMotorDatabase, email: str) -> Optional[UserInDB]:
     """Get user by email from database."""
-    user_doc = await db.users.find_one({"email": email})
+    user_doc = await db.users.find_one({"email": email}, USER_PROJECTION)
     if user_doc:
         user_doc["id"] = str(user_doc["_id"])
         return UserInDB(**user_doc)
@@ -36,7 +40,7 @@ async def get_user_by_email(db: AsyncIOMotorDatabase, email: str) -> Optional[Us
 async def get_user_by_id(db: AsyncIOMotorDatabase, user_id: str) -> Optional[UserInDB]:
     """Get user by ID from database."""
     try:
-        user_doc = await db.users.find_one({"_id": ObjectId(user_id)})
+        user_doc = await db.users.find_one({"_id": ObjectId(user_id)}, USER_PROJECTION)
         if user_doc:
             user_doc["id"] = str(user_doc["_id"])
             return UserInDB(**user_doc)
@@ -53,6 +57,7 @@ async def create_user(db: AsyncIOMotorDatabase, user: UserCreate) -> UserInDB:
         "provider": "local",
         "resumes": [],
         "preferences": {},
+        "plan": "free",
         "is_active": True
     }
     
@@ -98,9 +103,22 @@ async def get_current_user(
         id=user.id,
         name=user.name,
         email=user.email,
-        created_at=user.created_at
+        created_at=user.created_at,
+        plan=user.plan
     )
 
+async def get_optional_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+) -> Optional[User]:
+    """Get current user if a valid token is supplied, otherwise None."""
+    if credentials is None:
+        return None
+    try:
+        return await get_current_user(credentials, db)
+    except HTTPException:
+        return None
+
 @router.post("/signup", response_model=Token, status_code=status.HTTP_201_CREATED)
 async def signup(user: UserCreate, db: AsyncIOMotorDatabase = Depends(get_database)):
     """Register a new user."""
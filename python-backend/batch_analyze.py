@@ -0,0 +1,264 @@
+"""Analyze a directory or manifest of resumes offline, across all cores.
+
+Usage:
+    python batch_analyze.py RESUME_DIR_OR_MANIFEST --output results.jsonl
+    python batch_analyze.py archive/ --output results.parquet --job-description jd.txt
+
+Results are streamed to JSON Lines, or to a directory of Parquet part files
+when the output ends in .parquet (requires pyarrow). Files already present
+in the output are skipped, so re-running an interrupted job resumes it.
+Files that failed are retried on every run and a new record is appended,
+so when a path appears more than once its last record is the current one.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import Optional, List, Dict, Iterator, Set
+
+from analyzer import (
+    ANALYSIS_PROFILES,
+    resolve_profile,
+    extract_text_and_page_count,
+    extract_keywords_from_job_description,
+    analyze_text
+)
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt')
+PARQUET_ROWS_PER_PART = 1000
+# Fixed so parts where a column is all null still share one dataset schema
+PARQUET_SCHEMA = pyarrow.schema([
+    ("source_path", pyarrow.string()),
+    ("pages", pyarrow.int64()),
+    ("error", pyarrow.string()),
+    ("score", pyarrow.int64()),
+    ("percentage", pyarrow.float64()),
+    ("match_percentage", pyarrow.float64()),
+    ("word_count", pyarrow.int64()),
+    ("analysis", pyarrow.string()),
+]) if pyarrow is not None else None
+
+def iter_input_paths(source: str) -> Iterator[str]:
+    """Yield absolute resume paths from a directory tree or a manifest of paths.
+
+    Paths are normalized so the resume checkpoint matches however the
+    source was spelled on the command line.
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(os.path.abspath(source)):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    yield os.path.join(root, name)
+        return
+
+    # Manifest: one path per line, relative to the manifest's directory
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            path = line.strip()
+            if path and not path.startswith('#'):
+                yield os.path.normpath(os.path.join(base, path))
+
+class JsonlWriter:
+    """Append one JSON object per line; analyzed paths are read back on resume."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = None
+
+    def completed_paths(self) -> Set[str]:
+        completed = set()
+        if not os.path.exists(self.path):
+            return completed
+
+        valid_bytes = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                # A line cut off by an interrupted run is dropped and redone
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                    source_path = record["source_path"]
+                except (ValueError, KeyError):
+                    break
+                # Failed files are not checkpointed so they are retried
+                if "analysis" in record:
+                    completed.add(source_path)
+                valid_bytes += len(line)
+
+        with open(self.path, 'rb+') as f:
+            f.truncate(valid_bytes)
+        return completed
+
+    def write(self, record: Dict):
+        if self.file is None:
+            self.file = open(self.path, 'a', encoding='utf-8')
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+class ParquetWriter:
+    """Write rows to a directory of Parquet part files.
+
+    Each part is written to a temporary name and renamed once complete, so
+    an interrupted run only loses the rows of the part in progress.
+    """
+
+    def __init__(self, path: str, rows_per_part: int = PARQUET_ROWS_PER_PART):
+        if pyarrow is None:
+            raise RuntimeError("Parquet output requires the pyarrow package")
+        self.path = path
+        self.rows_per_part = rows_per_part
+        self.rows = []
+        os.makedirs(path, exist_ok=True)
+        self.part_index = len(self.part_files())
+
+    def part_files(self) -> List[str]:
+        return sorted(name for name in os.listdir(self.path) if name.endswith('.parquet'))
+
+    def completed_paths(self) -> Set[str]:
+        completed = set()
+        for name in self.part_files():
+            table = pyarrow.parquet.read_table(
+                os.path.join(self.path, name), columns=["source_path", "analysis"]
+            )
+            # Failed files are not checkpointed so they are retried
+            completed.update(
+                source_path for source_path, analysis in zip(
+                    table.column("source_path").to_pylist(), table.column("analysis").to_pylist()
+                ) if analysis is not None
+            )
+        return completed
+
+    def write(self, record: Dict):
+        analysis = record.get("analysis") or {}
+        self.rows.append({
+            "source_path": record["source_path"],
+            "pages": record.get("pages"),
+            "error": record.get("error"),
+            "score": analysis.get("ats_score", {}).get("score"),
+            "percentage": analysis.get("ats_score", {}).get("percentage"),
+            "match_percentage": analysis.get("keywords", {}).get("match_percentage"),
+            "word_count": analysis.get("word_count"),
+            "analysis": json.dumps(analysis, ensure_ascii=False) if analysis else None,
+        })
+        if len(self.rows) >= self.rows_per_part:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        part_name = f"part-{self.part_index:05d}.parquet"
+        part_path = os.path.join(self.path, part_name)
+        # Hidden temporary name, so a part left over by a crash is ignored
+        # when the directory is read back as a dataset
+        temp_path = os.path.join(self.path, f".{part_name}.tmp")
+        table = pyarrow.Table.from_pylist(self.rows, schema=PARQUET_SCHEMA)
+        pyarrow.parquet.write_table(table, temp_path)
+        os.replace(temp_path, part_path)
+        self.part_index += 1
+        self.rows = []
+
+    def close(self):
+        self.flush()
+
+def create_writer(output: str):
+    if output.endswith('.parquet'):
+        return ParquetWriter(output)
+    return JsonlWriter(output)
+
+# Set in each worker by init_worker so job keywords are extracted only once
+_worker_settings = {}
+
+def init_worker(job_description: Optional[str], job_keywords: List[str], profile: str):
+    _worker_settings.update(
+        job_description=job_description,
+        job_keywords=job_keywords,
+        profile=profile
+    )
+
+def analyze_path(path: str) -> Dict:
+    filename = os.path.basename(path)
+    record = {"source_path": path}
+    try:
+        content, record["pages"] = extract_text_and_page_count(path, filename)
+        if not content:
+            record["error"] = "Could not extract text from the file"
+            return record
+
+        record["analysis"] = analyze_text(
+            content,
+            filename,
+            _worker_settings["job_description"],
+            _worker_settings["profile"],
+            _worker_settings["job_keywords"]
+        )
+    except Exception as e:
+        record["error"] = str(e)
+    return record
+
+def report(label: str, files: int, pages: int, errors: int, started: float):
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label}: {files} files, {pages} pages, {errors} errors in {elapsed:.1f}s "
+        f"({files / elapsed if elapsed else 0:.1f} files/sec, "
+        f"{pages / elapsed if elapsed else 0:.1f} pages/sec)",
+        file=sys.stderr
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="Directory of resumes or manifest file listing one path per line")
+    parser.add_argument("--output", required=True, help="Output .jsonl file or .parquet directory")
+    parser.add_argument("--job-description", help="File containing the job description to score against")
+    parser.add_argument("--profile", choices=ANALYSIS_PROFILES, help="Analysis profile (default: ANALYSIS_PROFILE)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=16, help="Files handed to a worker at a time")
+    parser.add_argument("--progress-every", type=int, default=1000, help="Report throughput every N files")
+    args = parser.parse_args()
+
+    profile = resolve_profile(args.profile)
+    job_description = None
+    if args.job_description:
+        with open(args.job_description, 'r', encoding='utf-8') as f:
+            job_description = f.read()
+    job_keywords = extract_keywords_from_job_description(job_description, profile) if job_description else []
+
+    writer = create_writer(args.output)
+    completed = writer.completed_paths()
+    if completed:
+        print(f"Resuming: skipping {len(completed)} already analyzed files", file=sys.stderr)
+    pending = (path for path in iter_input_paths(args.source) if path not in completed)
+
+    files = pages = errors = 0
+    started = time.perf_counter()
+    try:
+        with Pool(args.workers, initializer=init_worker,
+                  initargs=(job_description, job_keywords, profile)) as pool:
+            for record in pool.imap_unordered(analyze_path, pending, chunksize=args.chunksize):
+                writer.write(record)
+                files += 1
+                pages += record.get("pages") or 0
+                errors += 1 if "error" in record else 0
+                if files % args.progress_every == 0:
+                    report("Progress", files, pages, errors, started)
+    finally:
+        writer.close()
+
+    report("Done", files, pages, errors, started)
+
+if __name__ == "__main__":
+    main()
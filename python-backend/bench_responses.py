@@ -0,0 +1,86 @@
+"""Measure serialization time and bytes on the wire for bulk analysis payloads.
+
+Usage: python bench_responses.py [--files 500] [--repeat 5]
+"""
+import argparse
+import random
+import time
+
+from analyzer import analyze_text, extract_text_from_file, extract_keywords_from_job_description
+from responses import encode_json, compress_body, compact_result, orjson, brotli
+from warmup import SAMPLE_RESUME_PATH, load_sample_job_description
+
+SKILL_POOL = [
+    "python", "java", "javascript", "react", "node.js", "sql", "aws", "docker",
+    "kubernetes", "git", "devops", "microservices", "analytics", "agile", "scrum",
+    "terraform", "golang", "rust", "spark", "kafka", "postgres", "redis", "graphql",
+    "typescript", "airflow", "pandas", "tensorflow", "linux", "jenkins", "azure",
+]
+
+def make_variant(content: str, index: int) -> str:
+    """Build a distinct resume per index so payloads compress like real ones."""
+    rng = random.Random(index)
+    lines = []
+    for line in content.splitlines():
+        # Short lines such as section headings are always kept
+        if len(line.split()) > 3 and rng.random() < 0.2:
+            continue
+        words = line.split()
+        if len(words) > 4:
+            rng.shuffle(words)
+        lines.append(' '.join(words))
+    lines[0] = f"Candidate {index} {rng.choice(['Lee', 'Patel', 'Garcia', 'Kim', 'Novak'])}"
+    lines.insert(1, f"candidate{index}@example.com | ({rng.randint(200, 999)}) 555-{index % 10000:04d}")
+    lines.append("Skills " + ", ".join(rng.sample(SKILL_POOL, rng.randint(4, 12))))
+    lines.append(f"{rng.randint(1, 20)} years of experience; {rng.randint(2, 40)} projects shipped")
+    return '\n'.join(lines)
+
+def build_bulk_payload(file_count: int, compact: bool) -> dict:
+    content = extract_text_from_file(SAMPLE_RESUME_PATH, "sample_resume.pdf")
+    job_description = load_sample_job_description()
+    job_keywords = extract_keywords_from_job_description(job_description)
+    results = []
+    for index in range(file_count):
+        result = analyze_text(
+            make_variant(content, index), f"resume_{index}.pdf", job_description,
+            job_keywords=job_keywords
+        )
+        result["file_index"] = index
+        results.append(compact_result(result) if compact else result)
+    return {"results": results, "total_files": file_count, "analysis_profile": results[0]["analysis_profile"]}
+
+def time_call(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    encoders = ["json"] + (["orjson"] if orjson else [])
+    encodings = ["gzip"] + (["br"] if brotli else [])
+
+    print(f"{args.files}-file bulk payload, best of {args.repeat}")
+    print(f"{'mode':<8} {'encoder':<8} {'encode ms':>10} {'raw bytes':>11} "
+          + " ".join(f"{enc + ' bytes':>11} {enc + ' ms':>8}" for enc in encodings))
+
+    for compact in (False, True):
+        payload = build_bulk_payload(args.files, compact)
+        for encoder in encoders:
+            encode_ms = time_call(lambda: encode_json(payload, encoder), args.repeat)
+            body = encode_json(payload, encoder)
+            columns = []
+            for encoding in encodings:
+                compress_ms = time_call(lambda: compress_body(body, encoding), args.repeat)
+                columns.append(f"{len(compress_body(body, encoding)):>11} {compress_ms:>8.1f}")
+            print(f"{'compact' if compact else 'full':<8} {encoder:<8} {encode_ms:>10.1f} "
+                  f"{len(body):>11} " + " ".join(columns))
+
+if __name__ == "__main__":
+    main()
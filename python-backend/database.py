@@ -26,6 +26,11 @@ async def connect_to_mongo():
         print(f"Error connecting to MongoDB: {e}")
         raise
 
+    # Paginated history queries filter by user and sort newest first
+    await db.database.resume_analyses.create_index([("user_id", 1), ("created_at", -1)])
+    # Bulk uploads look up earlier analyses of the same text
+    await db.database.resume_analyses.create_index([("user_id", 1), ("text_hash", 1)])
+
 async def close_mongo_connection():
     """Close database connection"""
     if db.client:
@@ -0,0 +1,58 @@
+import hashlib
+import random
+import re
+from typing import Optional, List, Set, Tuple
+
+# MinHash settings for near-duplicate detection
+MINHASH_PERMUTATIONS = 64
+SHINGLE_SIZE = 5
+NEAR_DUPLICATE_THRESHOLD = 0.9
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace so layout-only differences hash alike."""
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    words = normalize_text(text).split()
+    if len(words) <= size:
+        return {' '.join(words)}
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def minhash_signature(text: str) -> List[int]:
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for shingle in shingles(text)
+    ]
+    return [
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+def estimate_similarity(signature_a: List[int], signature_b: List[int]) -> float:
+    """Estimate the Jaccard similarity of two documents' shingle sets."""
+    if not signature_a or len(signature_a) != len(signature_b):
+        return 0.0
+    matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return matches / len(signature_a)
+
+def find_near_duplicate(signature: List[int],
+                        candidates: List[Tuple[str, List[int]]]) -> Optional[dict]:
+    """Return the most similar candidate at or above NEAR_DUPLICATE_THRESHOLD."""
+    best = None
+    for analysis_id, candidate in candidates:
+        similarity = estimate_similarity(signature, candidate)
+        if similarity >= NEAR_DUPLICATE_THRESHOLD and (best is None or similarity > best["similarity"]):
+            best = {"analysis_id": analysis_id, "similarity": round(similarity, 3)}
+    return best
@@ -0,0 +1,259 @@
+from datetime import datetime
+from typing import Optional, List, Tuple
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from database import get_database
+from models import User, RescoreRequest, AnalysisSummary, AnalysisHistoryPage
+from auth_routes import get_current_user
+from analyzer import SCORING_VERSION, rescore_analysis
+
+# Create router
+router = APIRouter(prefix="/history", tags=["history"])
+
+# Fields needed to list history without loading text, keywords or suggestions
+SUMMARY_PROJECTION = {
+    "file_info": 1,
+    "analysis_profile": 1,
+    "ats_score.score": 1,
+    "ats_score.percentage": 1,
+    "keywords.match_percentage": 1,
+    "has_job_description": 1,
+    "scoring_version": 1,
+    "created_at": 1,
+    "updated_at": 1,
+}
+
+# Fields needed to re-run the cheap scoring stages
+RESCORE_PROJECTION = {
+    "text": 1,
+    "sections_detected": 1,
+    "analysis_profile": 1,
+    "job_description": 1,
+    "keywords.job_keywords": 1,
+}
+
+# Stored alongside each analysis for duplicate detection, never returned
+FINGERPRINT_FIELDS = ("content_hash", "text_hash", "minhash")
+# How many recent analyses near-duplicate detection compares against
+NEAR_DUPLICATE_HISTORY_LIMIT = 1000
+
+async def save_analysis(db: AsyncIOMotorDatabase, user_id: str, content: str,
+                        job_description: Optional[str], result: dict,
+                        fingerprints: Optional[dict] = None) -> str:
+    """Store an analysis and its extracted text in the user's history."""
+    now = datetime.utcnow()
+    analysis_doc = {
+        **result,
+        **(fingerprints or {}),
+        "user_id": user_id,
+        "text": content,
+        "job_description": job_description,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+    # resume_analyses, indexed on user_id, is the source of truth for history;
+    # the user document is not touched so it stays small
+    inserted = await db.resume_analyses.insert_one(analysis_doc)
+    return str(inserted.inserted_id)
+
+async def get_analysis_doc(db: AsyncIOMotorDatabase, user_id: str, analysis_id: str,
+                           projection: Optional[dict] = None) -> Optional[dict]:
+    """Get one of the user's analyses by ID from database."""
+    try:
+        return await db.resume_analyses.find_one(
+            {"_id": ObjectId(analysis_id), "user_id": user_id}, projection
+        )
+    except Exception:
+        return None
+
+async def find_analysis_by_text_hash(db: AsyncIOMotorDatabase, user_id: str,
+                                     text_hash: str, profile: str) -> Optional[dict]:
+    """Find an earlier analysis of the same normalized text and profile."""
+    return await db.resume_analyses.find_one(
+        {"user_id": user_id, "text_hash": text_hash, "analysis_profile": profile},
+        sort=[("created_at", -1)]
+    )
+
+async def load_recent_signatures(db: AsyncIOMotorDatabase, user_id: str) -> List[Tuple[str, List[int]]]:
+    """Load (analysis_id, minhash) pairs for the user's recent analyses."""
+    cursor = (
+        db.resume_analyses.find({"user_id": user_id, "minhash": {"$exists": True}}, {"minhash": 1})
+        .sort("created_at", -1)
+        .limit(NEAR_DUPLICATE_HISTORY_LIMIT)
+    )
+    return [(str(analysis_doc["_id"]), analysis_doc["minhash"]) async for analysis_doc in cursor]
+
+def reuse_analysis(analysis_doc: dict, job_description: Optional[str]) -> dict:
+    """Build a response from a stored analysis, re-scored for job_description.
+
+    The stored record is left unchanged; only the cheap stages run.
+    """
+    if job_description == analysis_doc.get("job_description"):
+        job_keywords = analysis_doc.get("keywords", {}).get("job_keywords", [])
+    else:
+        job_keywords = None
+
+    scores = rescore_analysis(
+        analysis_doc["text"],
+        analysis_doc["sections_detected"],
+        analysis_doc["analysis_profile"],
+        job_description,
+        job_keywords
+    )
+
+    analysis = format_analysis(analysis_doc)
+    analysis.update({
+        "analysis_date": datetime.now().isoformat(),
+        "ats_score": scores["ats_score"],
+        "keywords": {**analysis["keywords"], **scores["keywords"]},
+        "suggestions": scores["suggestions"],
+        "scoring_version": scores["scoring_version"],
+        "has_job_description": bool(job_description),
+    })
+    return analysis
+
+async def apply_rescore(db: AsyncIOMotorDatabase, analysis_doc: dict,
+                        job_description: Optional[str] = None) -> dict:
+    """Re-run the scoring stages for a stored analysis and persist the result.
+
+    Without a new job description the stored job keywords are reused, so no
+    NLP runs at all.
+    """
+    if job_description is None:
+        job_description = analysis_doc.get("job_description")
+        job_keywords = analysis_doc.get("keywords", {}).get("job_keywords", [])
+    else:
+        job_keywords = None
+
+    scores = rescore_analysis(
+        analysis_doc["text"],
+        analysis_doc["sections_detected"],
+        analysis_doc["analysis_profile"],
+        job_description,
+        job_keywords
+    )
+
+    update = {
+        "ats_score": scores["ats_score"],
+        "suggestions": scores["suggestions"],
+        "scoring_version": scores["scoring_version"],
+        "job_description": job_description,
+        "has_job_description": bool(job_description),
+        "updated_at": datetime.utcnow(),
+    }
+    for key, value in scores["keywords"].items():
+        update[f"keywords.{key}"] = value
+
+    await db.resume_analyses.update_one({"_id": analysis_doc["_id"]}, {"$set": update})
+    return update
+
+def format_analysis(analysis_doc: dict) -> dict:
+    """Convert a stored analysis into the /analyze response shape."""
+    analysis = {
+        key: value for key, value in analysis_doc.items()
+        if key not in ("_id", "user_id", "text", "job_description", *FINGERPRINT_FIELDS)
+    }
+    analysis["analysis_id"] = str(analysis_doc["_id"])
+    for key in ("created_at", "updated_at"):
+        if isinstance(analysis.get(key), datetime):
+            analysis[key] = analysis[key].isoformat()
+    return analysis
+
+def to_summary(analysis_doc: dict) -> AnalysisSummary:
+    return AnalysisSummary(
+        id=str(analysis_doc["_id"]),
+        filename=analysis_doc["file_info"]["filename"],
+        file_type=analysis_doc["file_info"]["file_type"],
+        analysis_profile=analysis_doc.get("analysis_profile", "full"),
+        score=analysis_doc["ats_score"]["score"],
+        percentage=analysis_doc["ats_score"]["percentage"],
+        match_percentage=analysis_doc.get("keywords", {}).get("match_percentage", 0),
+        has_job_description=analysis_doc.get("has_job_description", False),
+        scoring_version=analysis_doc.get("scoring_version", 0),
+        created_at=analysis_doc["created_at"],
+        updated_at=analysis_doc["updated_at"]
+    )
+
+@router.get("", response_model=AnalysisHistoryPage)
+async def list_analyses(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """List the current user's analyses, newest first."""
+    query = {"user_id": current_user.id}
+    total = await db.resume_analyses.count_documents(query)
+    cursor = (
+        db.resume_analyses.find(query, SUMMARY_PROJECTION)
+        .sort("created_at", -1)
+        .skip((page - 1) * page_size)
+        .limit(page_size)
+    )
+    items = [to_summary(doc) async for doc in cursor]
+
+    return AnalysisHistoryPage(items=items, total=total, page=page, page_size=page_size)
+
+@router.post("/rescore")
+async def rescore_stale_analyses(
+    current_user: User = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Re-score every analysis scored with an older SCORING_VERSION."""
+    cursor = db.resume_analyses.find(
+        {"user_id": current_user.id, "scoring_version": {"$ne": SCORING_VERSION}},
+        RESCORE_PROJECTION
+    )
+    rescored = 0
+    async for analysis_doc in cursor:
+        await apply_rescore(db, analysis_doc)
+        rescored += 1
+
+    return {"rescored": rescored, "scoring_version": SCORING_VERSION}
+
+@router.get("/{analysis_id}")
+async def get_analysis(
+    analysis_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Get a stored analysis, re-scoring it first if the scoring rules changed."""
+    analysis_doc = await get_analysis_doc(db, current_user.id, analysis_id)
+    if not analysis_doc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found"
+        )
+
+    if analysis_doc.get("scoring_version") != SCORING_VERSION:
+        update = await apply_rescore(db, analysis_doc)
+        for key, value in update.items():
+            if key.startswith("keywords."):
+                analysis_doc["keywords"][key.split(".", 1)[1]] = value
+            else:
+                analysis_doc[key] = value
+
+    return format_analysis(analysis_doc)
+
+@router.post("/{analysis_id}/rescore")
+async def rescore_analysis_endpoint(
+    analysis_id: str,
+    request: RescoreRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Re-score a stored analysis, optionally against a new job description."""
+    analysis_doc = await get_analysis_doc(db, current_user.id, analysis_id, RESCORE_PROJECTION)
+    if not analysis_doc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found"
+        )
+
+    await apply_rescore(db, analysis_doc, request.job_description)
+    analysis_doc = await get_analysis_doc(db, current_user.id, analysis_id)
+
+    return format_analysis(analysis_doc)
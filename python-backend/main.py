@@ -1,22 +1,38 @@
-from fastapi import FastAPI, UploadFile, File, Form
+from fastapi import FastAPI, UploadFile, File, Form, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import JSONResponse
-from PyPDF2 import PdfReader
-import spacy
+from motor.motor_asyncio import AsyncIOMotorDatabase
 import uvicorn
+import asyncio
 import os
-import re
-from typing import Optional, List, Dict
-from docx import Document
-import json
+from typing import Optional, List
 from datetime import datetime
 
+from analyzer import (
+    ANALYSIS_PROFILES,
+    DEFAULT_ANALYSIS_PROFILE,
+    resolve_profile,
+    extract_text_from_file,
+    analyze_text
+)
+
 # Auth imports
-from auth_routes import auth_router
-from database import connect_to_mongo, close_mongo_connection
+from auth_routes import router as auth_router, get_optional_current_user
+from history_routes import (
+    router as history_router,
+    save_analysis,
+    find_analysis_by_text_hash,
+    load_recent_signatures,
+    reuse_analysis
+)
+from dedup import content_hash, text_hash, minhash_signature, find_near_duplicate
+from rate_limit import analysis_rate_limit, bulk_analysis_rate_limit, create_rate_limit_indexes
+from warmup import warm_up, warmup_state
+from responses import analysis_response, compact_result
+from database import connect_to_mongo, close_mongo_connection, get_database
+from models import User
 
 directory = os.path.dirname(__file__)
-nlp = spacy.load('en_core_web_sm')
 
 app = FastAPI()
 
@@ -35,315 +51,95 @@ app.add_middleware(
 
 # Include auth router
 app.include_router(auth_router, prefix="/api/auth", tags=["authentication"])
+app.include_router(history_router, prefix="/api")
 
 # Database event handlers
 @app.on_event("startup")
 async def startup_event():
+    # Warm up the analysis pipeline in a thread while MongoDB connects.
+    # Requests are only served once the connection succeeds, so /ready
+    # reports 503 until the warm-up has finished as well
+    app.state.warmup_task = asyncio.create_task(asyncio.to_thread(warm_up))
     await connect_to_mongo()
+    await create_rate_limit_indexes(get_database())
 
 @app.on_event("shutdown")
 async def shutdown_event():
     await close_mongo_connection()
 
-def parse_pdf(file_path: str) -> str:
-    with open(file_path, 'rb') as file:
-        reader = PdfReader(file)
-        text = ''
-        for page in reader.pages:
-            text += page.extract_text() or ''
-    return text
-
-def parse_docx(file_path: str) -> str:
-    doc = Document(file_path)
-    text = ''
-    for paragraph in doc.paragraphs:
-        text += paragraph.text + '\n'
-    return text
-
-def extract_email(text: str) -> Optional[str]:
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
-    return emails[0] if emails else None
-
-def extract_phone(text: str) -> Optional[str]:
-    phone_patterns = [
-        r'\(\d{3}\)\s*\d{3}[-.]?\d{4}',
-        r'\d{3}[-.]?\d{3}[-.]?\d{4}',
-        r'\+\d{1,3}\s*\d{3}\s*\d{3}\s*\d{4}'
-    ]
-    for pattern in phone_patterns:
-        phones = re.findall(pattern, text)
-        if phones:
-            return phones[0]
-    return None
-
-def extract_linkedin(text: str) -> Optional[str]:
-    linkedin_pattern = r'(?:https?://)?(?:www\.)?linkedin\.com/in/[A-Za-z0-9-]+'
-    matches = re.findall(linkedin_pattern, text, re.IGNORECASE)
-    return matches[0] if matches else None
-
-def detect_sections(text: str) -> Dict[str, bool]:
-    sections = {
-        'contact_info': bool(extract_email(text) or extract_phone(text)),
-        'summary': bool(re.search(r'\b(summary|objective|profile)\b', text, re.IGNORECASE)),
-        'experience': bool(re.search(r'\b(experience|employment|work history)\b', text, re.IGNORECASE)),
-        'education': bool(re.search(r'\b(education|degree|university|college)\b', text, re.IGNORECASE)),
-        'skills': bool(re.search(r'\b(skills|competencies|technologies)\b', text, re.IGNORECASE)),
-        'projects': bool(re.search(r'\b(projects|portfolio)\b', text, re.IGNORECASE)),
-        'certifications': bool(re.search(r'\b(certifications?|licenses?)\b', text, re.IGNORECASE))
-    }
-    return sections
-
-def extract_keywords_from_job_description(job_desc: str) -> List[str]:
-    if not job_desc:
-        return []
-    
-    doc = nlp(job_desc.lower())
-    # Extract technical skills, tools, and important terms
-    keywords = []
-    
-    # Common technical terms and skills
-    tech_patterns = [
-        r'\b(python|java|javascript|react|node\.?js|sql|aws|docker|kubernetes)\b',
-        r'\b(machine learning|ai|data science|analytics|agile|scrum)\b',
-        r'\b(git|github|ci/cd|devops|api|rest|microservices)\b'
-    ]
-    
-    for pattern in tech_patterns:
-        matches = re.findall(pattern, job_desc.lower())
-        keywords.extend(matches)
-    
-    # Extract entities and noun phrases
-    for ent in doc.ents:
-        if ent.label_ in ['ORG', 'PRODUCT', 'SKILL']:
-            keywords.append(ent.text)
-    
-    # Extract important nouns
-    for token in doc:
-        if (token.pos_ == 'NOUN' and 
-            len(token.text) > 2 and 
-            not token.is_stop and 
-            token.is_alpha):
-            keywords.append(token.text)
-    
-    return list(set(keywords))
-
-def calculate_ats_score(resume_text: str, sections: Dict[str, bool], 
-                       job_keywords: List[str] = None) -> Dict:
-    score = 0
-    max_score = 100
-    feedback = []
-    
-    # Section completeness (40 points)
-    required_sections = ['contact_info', 'experience', 'education', 'skills']
-    section_score = sum(20 if sections.get(section, False) else 0 for section in required_sections[:2])
-    section_score += sum(10 if sections.get(section, False) else 0 for section in required_sections[2:])
-    
-    if not sections.get('contact_info'):
-        feedback.append("Add contact information (email, phone number)")
-    if not sections.get('experience'):
-        feedback.append("Include work experience section")
-    if not sections.get('education'):
-        feedback.append("Add education section")
-    if not sections.get('skills'):
-        feedback.append("Include a skills section")
-    
-    score += section_score
-    
-    # Content quality (30 points)
-    word_count = len(resume_text.split())
-    if word_count < 200:
-        feedback.append("Resume is too brief. Add more details about your experience")
-        score += 5
-    elif word_count > 800:
-        feedback.append("Resume is too lengthy. Consider condensing to 1-2 pages")
-        score += 20
-    else:
-        score += 30
-    
-    # Keyword matching (30 points) - only if job description provided
-    if job_keywords:
-        resume_lower = resume_text.lower()
-        matched_keywords = [kw for kw in job_keywords if kw in resume_lower]
-        keyword_score = min(30, len(matched_keywords) * 3)
-        score += keyword_score
-        
-        if len(matched_keywords) < len(job_keywords) * 0.3:
-            feedback.append(f"Include more relevant keywords from the job description")
-    else:
-        score += 15  # Partial score when no job description provided
-    
-    return {
-        'score': min(score, max_score),
-        'max_score': max_score,
-        'feedback': feedback
-    }
-
-def generate_correction_suggestions(resume_text: str, sections: Dict[str, bool], 
-                                  job_keywords: List[str] = None) -> List[Dict]:
-    suggestions = []
-    
-    # Format suggestions
-    if len(resume_text.split()) > 800:
-        suggestions.append({
-            'type': 'format',
-            'priority': 'high',
-            'title': 'Resume Length',
-            'description': 'Your resume is too long. Aim for 1-2 pages maximum.',
-            'suggestion': 'Remove outdated experiences and focus on recent, relevant accomplishments.'
-        })
-    
-    # Section suggestions
-    if not sections.get('summary'):
-        suggestions.append({
-            'type': 'content',
-            'priority': 'medium',
-            'title': 'Professional Summary',
-            'description': 'Add a professional summary at the top of your resume.',
-            'suggestion': 'Include 2-3 sentences highlighting your key qualifications and career goals.'
-        })
-    
-    if not sections.get('projects') and 'developer' in resume_text.lower():
-        suggestions.append({
-            'type': 'content',
-            'priority': 'medium',
-            'title': 'Projects Section',
-            'description': 'Consider adding a projects section to showcase your work.',
-            'suggestion': 'Include 2-3 relevant projects with brief descriptions and technologies used.'
-        })
-    
-    # Keyword suggestions
-    if job_keywords:
-        resume_lower = resume_text.lower()
-        missing_keywords = [kw for kw in job_keywords[:10] if kw not in resume_lower]
-        
-        if missing_keywords:
-            suggestions.append({
-                'type': 'keywords',
-                'priority': 'high',
-                'title': 'Missing Keywords',
-                'description': f'Your resume is missing key terms from the job description.',
-                'suggestion': f'Consider incorporating: {", ".join(missing_keywords[:5])}'
-            })
-    
-    # Contact info suggestions
-    if not extract_email(resume_text):
-        suggestions.append({
-            'type': 'contact',
-            'priority': 'high',
-            'title': 'Email Address',
-            'description': 'No email address found.',
-            'suggestion': 'Add a professional email address to your contact information.'
-        })
-    
-    if not extract_phone(resume_text):
-        suggestions.append({
-            'type': 'contact',
-            'priority': 'medium',
-            'title': 'Phone Number',
-            'description': 'No phone number found.',
-            'suggestion': 'Include a phone number in your contact information.'
-        })
-    
-    return suggestions
-
-def analyze_resume(file: UploadFile, job_description: Optional[str] = None) -> dict:
+def extract_upload_text(filename: str, data: bytes) -> str:
     # Save the file locally
-    file_name = f"{directory}/{file.filename}"
+    file_name = f"{directory}/{filename}"
     with open(file_name, "wb") as buffer:
-        buffer.write(file.file.read())
-
-    # Read and parse the file based on its type
-    content = ''
-    if file.filename.lower().endswith('.pdf'):
-        content = parse_pdf(file_name)
-    elif file.filename.lower().endswith(('.docx', '.doc')):
-        content = parse_docx(file_name)
-    else:
-        # For other file types, try to read as text
-        try:
-            with open(file_name, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except:
-            content = ''
+        buffer.write(data)
 
-    if not content:
+    try:
+        return extract_text_from_file(file_name, filename)
+    finally:
+        # Clean up the file
         os.remove(file_name)
-        return {"error": "Could not extract text from the uploaded file"}
 
-    # Perform NLP analysis
-    doc = nlp(content)
+async def analyze_and_store(content: str, filename: str, job_description: Optional[str],
+                            profile: str, current_user: Optional[User],
+                            db: AsyncIOMotorDatabase,
+                            fingerprints: Optional[dict] = None) -> dict:
+    result = analyze_text(content, filename, job_description, profile)
 
-    # Extract basic information
-    email = extract_email(content)
-    phone = extract_phone(content)
-    linkedin = extract_linkedin(content)
-    
-    # Detect resume sections
-    sections = detect_sections(content)
-    
-    # Extract keywords from resume
-    resume_keywords = [token.text.lower() for token in doc 
-                      if token.is_alpha and not token.is_stop and len(token.text) > 2]
-    unique_resume_keywords = list(set(resume_keywords))[:20]
-    
-    # Extract job description keywords if provided
-    job_keywords = extract_keywords_from_job_description(job_description) if job_description else []
-    
-    # Calculate ATS score
-    ats_analysis = calculate_ats_score(content, sections, job_keywords)
-    
-    # Generate correction suggestions
-    suggestions = generate_correction_suggestions(content, sections, job_keywords)
-    
-    # Find matching and missing keywords
-    matched_keywords = [kw for kw in job_keywords if kw in content.lower()] if job_keywords else []
-    missing_keywords = [kw for kw in job_keywords if kw not in content.lower()] if job_keywords else []
-    
-    # Build comprehensive response
-    response = {
-        "analysis_date": datetime.now().isoformat(),
-        "file_info": {
-            "filename": file.filename,
-            "file_type": file.filename.split('.')[-1].lower()
-        },
-        "contact_info": {
-            "email": email,
-            "phone": phone,
-            "linkedin": linkedin
-        },
-        "sections_detected": sections,
-        "ats_score": {
-            "score": ats_analysis['score'],
-            "max_score": ats_analysis['max_score'],
-            "percentage": round((ats_analysis['score'] / ats_analysis['max_score']) * 100, 1),
-            "feedback": ats_analysis['feedback']
-        },
-        "keywords": {
-            "resume_keywords": unique_resume_keywords,
-            "job_keywords": job_keywords,
-            "matched_keywords": matched_keywords,
-            "missing_keywords": missing_keywords[:10],  # Limit to top 10
-            "match_percentage": round((len(matched_keywords) / len(job_keywords)) * 100, 1) if job_keywords else 0
-        },
-        "suggestions": suggestions,
-        "word_count": len(content.split()),
-        "has_job_description": bool(job_description)
-    }
+    # Keep a history for signed-in users so later re-scoring skips extraction
+    if current_user is not None:
+        result["analysis_id"] = await save_analysis(
+            db, current_user.id, content, job_description, result, fingerprints
+        )
+
+    return result
 
-    # Clean up the file
-    os.remove(file_name)
+def build_file_info(filename: str) -> dict:
+    return {
+        "filename": filename,
+        "file_type": filename.split('.')[-1].lower()
+    }
 
-    return response
+def duplicate_result(original: dict, filename: str, file_index: int) -> dict:
+    """Fan an analysis out to another upload of the same document."""
+    result = dict(original)
+    result["file_info"] = build_file_info(filename)
+    result["file_index"] = file_index
+    result["duplicate_of"] = original["file_index"]
+    return result
 
-@app.post("/analyze")
+@app.post("/analyze", dependencies=[Depends(analysis_rate_limit)])
 async def analyze_resume_endpoint(
+    request: Request,
     file: UploadFile = File(...),
-    job_description: Optional[str] = Form(None)
+    job_description: Optional[str] = Form(None),
+    profile: Optional[str] = Form(None),
+    compact: bool = Form(False),
+    current_user: Optional[User] = Depends(get_optional_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     try:
-        result = analyze_resume(file, job_description)
-        return JSONResponse(content=result)
+        profile = resolve_profile(profile)
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
+    try:
+        data = file.file.read()
+        content = extract_upload_text(file.filename, data)
+        if not content:
+            return JSONResponse(content={"error": "Could not extract text from the uploaded file"})
+
+        # Fingerprints let later bulk uploads spot this resume in the history
+        fingerprints = {
+            "content_hash": content_hash(data),
+            "text_hash": text_hash(content),
+            "minhash": minhash_signature(content)
+        } if current_user is not None else None
+        result = await analyze_and_store(
+            content, file.filename, job_description, profile, current_user, db, fingerprints
+        )
+        if compact:
+            result = compact_result(result)
+        return analysis_response(request, result)
     except Exception as e:
         return JSONResponse(content={"error": str(e)}, status_code=500)
 
@@ -351,31 +147,128 @@ async def analyze_resume_endpoint(
 async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
+@app.get("/ready")
+async def readiness_check():
+    if warmup_state.error:
+        readiness = "failed"
+    elif not warmup_state.ready:
+        readiness = "warming_up"
+    else:
+        readiness = "ready"
+
+    content = {
+        "status": readiness,
+        "warmup": warmup_state.timings,
+        "timestamp": datetime.now().isoformat()
+    }
+    if warmup_state.error:
+        content["error"] = warmup_state.error
+    return JSONResponse(content=content, status_code=200 if readiness == "ready" else 503)
+
 @app.get("/")
 async def root():
-    return {"message": "Resume Analyzer API", "version": "1.0.0"}
+    return {
+        "message": "Resume Analyzer API",
+        "version": "1.0.0",
+        "analysis_profiles": list(ANALYSIS_PROFILES),
+        "default_analysis_profile": DEFAULT_ANALYSIS_PROFILE
+    }
 
-@app.post("/analyze/bulk")
+@app.post("/analyze/bulk", dependencies=[Depends(bulk_analysis_rate_limit)])
 async def analyze_multiple_resumes(
+    request: Request,
     files: List[UploadFile] = File(...),
-    job_description: Optional[str] = Form(None)
+    job_description: Optional[str] = Form(None),
+    profile: Optional[str] = Form(None),
+    compact: bool = Form(False),
+    detect_near_duplicates: bool = Form(False),
+    current_user: Optional[User] = Depends(get_optional_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    """Analyze multiple resumes against a job description"""
+    """Analyze multiple resumes against a job description.
+
+    Identical files, or files whose normalized text is identical, are analyzed
+    once and the result is fanned out with a duplicate_of marker.
+    """
+    try:
+        profile = resolve_profile(profile)
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
     results = []
+    # content/text hash -> file_index of the first analyzed copy
+    analyzed_hashes = {}
+    analyzed_files = 0
+    # Loaded once per request; files analyzed below are appended so
+    # near-duplicates within the batch are caught too
+    recent_signatures = []
+    if current_user is not None and detect_near_duplicates:
+        recent_signatures = await load_recent_signatures(db, current_user.id)
     
     for file in files:
+        file_index = len(results)
         try:
-            result = analyze_resume(file, job_description)
-            result["file_index"] = len(results)
-            results.append(result)
+            data = file.file.read()
+            file_hash = content_hash(data)
+            if file_hash in analyzed_hashes:
+                results.append(duplicate_result(results[analyzed_hashes[file_hash]], file.filename, file_index))
+                continue
+
+            content = extract_upload_text(file.filename, data)
+            if not content:
+                results.append({
+                    "file_index": file_index,
+                    "error": "Could not extract text from the uploaded file"
+                })
+                continue
+
+            normalized_hash = text_hash(content)
+            if normalized_hash in analyzed_hashes:
+                results.append(duplicate_result(results[analyzed_hashes[normalized_hash]], file.filename, file_index))
+                analyzed_hashes[file_hash] = analyzed_hashes[normalized_hash]
+                continue
+
+            fingerprints = {"content_hash": file_hash, "text_hash": normalized_hash}
+            near_duplicate = None
+            previous = None
+            if current_user is not None:
+                # Same text analyzed in an earlier submission: only re-score it
+                previous = await find_analysis_by_text_hash(db, current_user.id, normalized_hash, profile)
+                if previous is None:
+                    fingerprints["minhash"] = minhash_signature(content)
+                    if detect_near_duplicates:
+                        near_duplicate = find_near_duplicate(fingerprints["minhash"], recent_signatures)
+
+            if previous is not None:
+                result = reuse_analysis(previous, job_description)
+                result["file_info"] = build_file_info(file.filename)
+                result["duplicate_of_analysis"] = result["analysis_id"]
+            else:
+                result = await analyze_and_store(
+                    content, file.filename, job_description, profile, current_user, db, fingerprints
+                )
+                analyzed_files += 1
+                if detect_near_duplicates and "minhash" in fingerprints:
+                    recent_signatures.append((result["analysis_id"], fingerprints["minhash"]))
+            if near_duplicate:
+                result["near_duplicate_of"] = near_duplicate
+
+            result["file_index"] = file_index
+            results.append(compact_result(result) if compact else result)
+            analyzed_hashes[file_hash] = analyzed_hashes[normalized_hash] = file_index
         except Exception as e:
             results.append({
-                "file_index": len(results),
+                "file_index": file_index,
                 "filename": file.filename,
                 "error": str(e)
             })
     
-    return JSONResponse(content={"results": results, "total_files": len(files)})
+    return analysis_response(request, {
+        "results": results,
+        "total_files": len(files),
+        "analyzed_files": analyzed_files,
+        "analysis_profile": profile
+    })
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
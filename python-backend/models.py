@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 # Request models
@@ -21,6 +21,7 @@ class User(BaseModel):
     name: str
     email: str
     created_at: datetime
+    plan: str = "free"
     
     class Config:
         from_attributes = True
@@ -44,6 +45,30 @@ class UserInDB(BaseModel):
     created_at: datetime
     updated_at: datetime
     is_active: bool = True
+    plan: str = "free"
 
     class Config:
         from_attributes = True
+
+# Resume analysis history models
+class RescoreRequest(BaseModel):
+    job_description: Optional[str] = None
+
+class AnalysisSummary(BaseModel):
+    id: str
+    filename: str
+    file_type: str
+    analysis_profile: str
+    score: int
+    percentage: float
+    match_percentage: float
+    has_job_description: bool
+    scoring_version: int
+    created_at: datetime
+    updated_at: datetime
+
+class AnalysisHistoryPage(BaseModel):
+    items: List[AnalysisSummary]
+    total: int
+    page: int
+    page_size: int
@@ -0,0 +1,215 @@
+import asyncio
+import json
+import math
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Tuple
+from fastapi import Depends, HTTPException, Request, UploadFile, File, status
+from pymongo import ReturnDocument
+
+from auth_routes import get_optional_current_user
+from database import get_database
+from models import User
+
+# Per-plan limits. "anonymous" applies to requests without a valid token,
+# which are limited per client IP instead of per user.
+PLAN_LIMITS = {
+    "anonymous": {"requests_per_minute": 10, "burst": 5, "max_concurrent": 1},
+    "free": {"requests_per_minute": 20, "burst": 10, "max_concurrent": 2},
+    "pro": {"requests_per_minute": 120, "burst": 60, "max_concurrent": 8},
+}
+# Override or add plans, e.g. RATE_LIMIT_PLANS='{"pro": {"max_concurrent": 16}}'
+for plan_name, overrides in json.loads(os.getenv("RATE_LIMIT_PLANS", "{}")).items():
+    PLAN_LIMITS[plan_name] = {**PLAN_LIMITS.get(plan_name, PLAN_LIMITS["free"]), **overrides}
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+# Suggested wait when a request is rejected for exceeding the concurrency cap
+CONCURRENCY_RETRY_AFTER = 1
+# Concurrency leases left behind by a crashed worker expire after this long;
+# keep it above the longest request so only dead slots are ever reclaimed
+CONCURRENCY_LEASE_SECONDS = int(os.getenv("CONCURRENCY_LEASE_SECONDS", "3600"))
+
+def get_plan_limits(plan: str) -> Dict:
+    return PLAN_LIMITS.get(plan, PLAN_LIMITS["free"])
+
+class InMemoryRateLimitBackend:
+    """Token buckets and in-flight counters local to this worker process."""
+
+    def __init__(self):
+        self.buckets: Dict[str, Tuple[float, float]] = {}
+        self.in_flight: Dict[str, int] = {}
+        self.lock = asyncio.Lock()
+
+    async def consume(self, key: str, cost: int, rate: float, burst: int) -> Tuple[bool, float]:
+        async with self.lock:
+            now = time.monotonic()
+            tokens, updated_at = self.buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            allowed = tokens >= min(cost, burst)
+            if allowed:
+                tokens -= cost
+            self.buckets[key] = (tokens, now)
+        return allowed, tokens
+
+    async def acquire(self, key: str, max_concurrent: int) -> Optional[str]:
+        async with self.lock:
+            if self.in_flight.get(key, 0) >= max_concurrent:
+                return None
+            self.in_flight[key] = self.in_flight.get(key, 0) + 1
+        return uuid.uuid4().hex
+
+    async def release(self, key: str, lease_id: str):
+        async with self.lock:
+            remaining = self.in_flight.get(key, 0) - 1
+            if remaining > 0:
+                self.in_flight[key] = remaining
+            else:
+                self.in_flight.pop(key, None)
+
+class MongoRateLimitBackend:
+    """Token buckets and in-flight leases shared by all workers via MongoDB."""
+
+    async def consume(self, key: str, cost: int, rate: float, burst: int) -> Tuple[bool, float]:
+        db = get_database()
+        now = datetime.utcnow()
+        # Refill and consume in a single atomic pipeline update
+        elapsed_seconds = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, 1000]}
+        bucket = await db.rate_limit_buckets.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {
+                    "tokens": {"$min": [
+                        burst,
+                        {"$add": [{"$ifNull": ["$tokens", burst]}, {"$multiply": [elapsed_seconds, rate]}]}
+                    ]},
+                    "updated_at": now,
+                }},
+                {"$set": {"allowed": {"$gte": ["$tokens", min(cost, burst)]}}},
+                {"$set": {"tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]}}},
+                # Expire the bucket once it would have refilled completely
+                {"$set": {"expires_at": {"$add": [
+                    now, {"$multiply": [{"$divide": [{"$subtract": [burst, "$tokens"]}, rate]}, 1000]}
+                ]}}},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return bucket["allowed"], bucket["tokens"]
+
+    async def acquire(self, key: str, max_concurrent: int) -> Optional[str]:
+        db = get_database()
+        now = datetime.utcnow()
+        lease_id = uuid.uuid4().hex
+        lease = {"request_id": lease_id, "expires_at": now + timedelta(seconds=CONCURRENCY_LEASE_SECONDS)}
+        # Drop expired leases, then add ours if a slot is free, atomically
+        slots = await db.rate_limit_in_flight.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"leases": {"$filter": {
+                    "input": {"$ifNull": ["$leases", []]},
+                    "cond": {"$gt": ["$$this.expires_at", now]},
+                }}}},
+                {"$set": {"leases": {"$cond": [
+                    {"$lt": [{"$size": "$leases"}, max_concurrent]},
+                    {"$concatArrays": ["$leases", [{"$literal": lease}]]},
+                    "$leases",
+                ]}}},
+                # The document itself expires only once every lease has
+                {"$set": {"expires_at": {"$cond": [
+                    {"$eq": [{"$size": "$leases"}, 0]},
+                    now,
+                    {"$max": "$leases.expires_at"},
+                ]}}},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        if any(entry["request_id"] == lease_id for entry in slots["leases"]):
+            return lease_id
+        return None
+
+    async def release(self, key: str, lease_id: str):
+        db = get_database()
+        await db.rate_limit_in_flight.update_one(
+            {"_id": key},
+            {"$pull": {"leases": {"request_id": lease_id}}},
+        )
+
+def create_backend(name: str):
+    if name == "memory":
+        return InMemoryRateLimitBackend()
+    if name == "mongo":
+        return MongoRateLimitBackend()
+    raise ValueError(f"Invalid RATE_LIMIT_BACKEND: {name}")
+
+backend = create_backend(RATE_LIMIT_BACKEND)
+
+async def create_rate_limit_indexes(db):
+    """Remove full token buckets and concurrency documents with no live leases."""
+    if RATE_LIMIT_BACKEND == "mongo":
+        await db.rate_limit_buckets.create_index("expires_at", expireAfterSeconds=0)
+        await db.rate_limit_in_flight.create_index("expires_at", expireAfterSeconds=0)
+
+def get_client_identity(request: Request, current_user: Optional[User]) -> Tuple[str, str]:
+    """Return the rate limit key and plan for the caller."""
+    if current_user is not None:
+        return f"user:{current_user.id}", current_user.plan
+    client_host = request.client.host if request.client else "unknown"
+    return f"ip:{client_host}", "anonymous"
+
+async def enforce_limits(request: Request, current_user: Optional[User], cost: int) -> Tuple[str, str]:
+    """Consume rate limit tokens and take a concurrency slot for the caller.
+
+    Returns the key and lease ID to release once the request finishes.
+    """
+    key, plan = get_client_identity(request, current_user)
+    limits = get_plan_limits(plan)
+    rate = limits["requests_per_minute"] / 60
+    # The full cost is always charged. A bulk request larger than the bucket
+    # needs a full bucket and leaves it in debt, so later requests wait
+    # until the debt has refilled
+    required = min(cost, limits["burst"])
+
+    allowed, tokens = await backend.consume(key, cost, rate, limits["burst"])
+    if not allowed:
+        retry_after = math.ceil((required - tokens) / rate) if rate > 0 else 60
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(max(retry_after, 1))},
+        )
+
+    lease_id = await backend.acquire(key, limits["max_concurrent"])
+    if lease_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many concurrent analysis requests",
+            headers={"Retry-After": str(CONCURRENCY_RETRY_AFTER)},
+        )
+
+    return key, lease_id
+
+async def analysis_rate_limit(
+    request: Request,
+    current_user: Optional[User] = Depends(get_optional_current_user)
+):
+    """Limit /analyze calls; each request costs one token."""
+    key, lease_id = await enforce_limits(request, current_user, 1)
+    try:
+        yield
+    finally:
+        await backend.release(key, lease_id)
+
+async def bulk_analysis_rate_limit(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    current_user: Optional[User] = Depends(get_optional_current_user)
+):
+    """Limit /analyze/bulk calls; each file costs one token."""
+    key, lease_id = await enforce_limits(request, current_user, len(files))
+    try:
+        yield
+    finally:
+        await backend.release(key, lease_id)
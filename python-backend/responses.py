@@ -0,0 +1,100 @@
+import gzip
+import json
+import os
+from typing import Optional, Dict
+from fastapi import Request
+from starlette.responses import Response
+
+# Optional faster encoders/compressors; fall back to the stdlib when missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_ENCODER = os.getenv("JSON_ENCODER", "orjson" if orjson else "json")
+# Payloads smaller than this are sent uncompressed
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+if JSON_ENCODER not in ("orjson", "json"):
+    raise ValueError(f"Invalid JSON_ENCODER: {JSON_ENCODER}")
+if JSON_ENCODER == "orjson" and orjson is None:
+    raise ValueError("JSON_ENCODER=orjson requires the orjson package")
+
+def encode_json(content, encoder: str = JSON_ENCODER) -> bytes:
+    if encoder == "orjson":
+        return orjson.dumps(content)
+    # Same output as starlette's JSONResponse
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, honouring q=0."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+def compact_result(result: Dict) -> Dict:
+    """Drop resume keywords and suggestion prose, keeping scores and titles."""
+    compact = dict(result)
+    if "keywords" in compact:
+        compact["keywords"] = {
+            key: value for key, value in compact["keywords"].items()
+            if key != "resume_keywords"
+        }
+    if "suggestions" in compact:
+        compact["suggestions"] = [
+            {key: value for key, value in suggestion.items()
+             if key not in ("description", "suggestion")}
+            for suggestion in compact["suggestions"]
+        ]
+    return compact
+
+def analysis_response(request: Request, content, status_code: int = 200) -> Response:
+    """Serialize with the configured encoder and compress when the client allows."""
+    body = encode_json(content)
+    headers = {"Vary": "Accept-Encoding"}
+
+    if len(body) >= COMPRESSION_MIN_BYTES:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+        if encoding:
+            body = compress_body(body, encoding)
+            headers["Content-Encoding"] = encoding
+
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )